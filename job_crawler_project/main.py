@@ -4,24 +4,30 @@ Comprehensive career scraper for multiple companies in the DC area and beyond.
 Handles different ATS systems (Workday, Greenhouse, SmartRecruiters, Lever, etc.)
 """
 import csv
+import functools
+import hashlib
 import logging
 import time
 import urllib.robotparser
 import re
+import sqlite3
+import threading
+from collections import defaultdict
+from contextlib import closing
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from operator import itemgetter
 from random import uniform
-from typing import List, Dict, Optional, Tuple
-from urllib.parse import urljoin, urlparse
+from typing import TYPE_CHECKING, Any, Callable, List, Dict, Optional, TextIO, Tuple
+from urllib.parse import urljoin, urlparse, urlunparse
 
+import orjson
 import requests
-from bs4 import BeautifulSoup
 from requests.adapters import HTTPAdapter, Retry
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# Selenium and selectolax are only needed once a site falls back to a browser,
+# so they are imported inside the functions that use them
+if TYPE_CHECKING:
+    from selenium import webdriver
 
 # Configuration constants
 MAX_JOBS_PER_SITE = 200
@@ -31,7 +37,20 @@ RETRY_BACKOFF_FACTOR = 1
 MIN_DELAY_SECONDS = 1.5
 MAX_DELAY_SECONDS = 3.5
 SELENIUM_WAIT_TIMEOUT = 15
+MAX_CARD_TEXT_LENGTH = 500
+GENERIC_WAIT_TIMEOUT = 5
+HTTP_WORKERS = 8
+SELENIUM_WORKERS = 4  # Each headless Chrome holds ~150MB, so RAM is the limit here
+HTTP_POOL_SIZE = 32
 OUTPUT_CSV = "all_companies_jobs.csv"
+OUTPUT_DB = "all_companies_jobs.db"  # Kept across runs so repeat postings are skipped
+CSV_FIELDS = ("company", "title", "location", "url")
+WORKDAY_PAGE_SIZE = 20
+SMARTRECRUITERS_PAGE_SIZE = 100
+
+# Public JSON endpoints for hosted ATS job boards
+GREENHOUSE_API_URL = "https://boards-api.greenhouse.io/v1/boards/{token}/jobs"
+LEVER_API_URL = "https://api.lever.co/v0/postings/{company}"
 
 # HTTP headers
 HEADERS = {
@@ -51,6 +70,147 @@ HEADERS = {
     "Cache-Control": "max-age=0",
 }
 
+# Resources Chrome never needs to fetch to extract job listings
+BLOCKED_URL_PATTERNS = [
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+    "*.svg",
+    "*.woff*",
+    "*.ttf",
+    "*.mp4",
+    "*google-analytics*",
+    "*googletagmanager*",
+    "*doubleclick*",
+    "*facebook.net*",
+    "*segment.io*",
+]
+
+# Runs in the page: uses the first card selector with matches and returns
+# [{title, location, href}] for up to `limit` of its cards ([] if none match).
+# A card that itself matches the title selector (e.g. a title link) is its own title.
+EXTRACT_CARDS_JS = """
+const [cardSelectors, titleSelector, locationSelector, limit] = arguments;
+for (const cardSelector of cardSelectors) {
+    const cards = document.querySelectorAll(cardSelector);
+    if (!cards.length) {
+        continue;
+    }
+    return Array.from(cards).slice(0, limit).map(card => {
+        const title = card.matches(titleSelector) ? card : card.querySelector(titleSelector);
+        const location = card.querySelector(locationSelector);
+        const link = card.tagName === "A" ? card : card.querySelector("a");
+        return {
+            title: title ? title.innerText : null,
+            location: location ? location.innerText : null,
+            href: (title && title.href) || (link && link.href) || null
+        };
+    });
+}
+return [];
+"""
+
+# Site navigation links such as "Careers" -> /jobs are in the initial DOM, before
+# any job cards render, so the link selectors skip links in the page chrome
+PAGE_CHROME_LINK_FILTER = ":not(nav a):not(header a):not(footer a)"
+
+# Card selectors for career pages without a known ATS, in priority order
+GENERIC_CARD_SELECTORS = [
+    "a[href*='/job']:not([class*='filter'])" + PAGE_CHROME_LINK_FILTER,
+    "a[href*='/career']:not([class*='filter'])" + PAGE_CHROME_LINK_FILTER,
+    "div[class*='job-card']",
+    "li[class*='job-item']",
+    "article[class*='job']",
+    "div.opening",
+    "[data-job-id]",
+    "div[class*='posting']",
+    "tbody tr:has(a)",
+]
+
+# Runs in the page: returns the first selector (in priority order) with matches and, for up
+# to `limit` of its elements, the rendered innerText and the outerHTML tagged with
+# data-scraper-card. Elements whose text is longer than `maxTextLength` are page wrappers
+# rather than cards and are left out before they are serialized. Table parts are wrapped
+# so they survive being parsed outside their table.
+PROBE_SELECTORS_JS = """
+const [selectors, limit, maxTextLength] = arguments;
+const wrappers = {
+    TR: ["<table>", "</table>"],
+    TD: ["<table><tr>", "</tr></table>"],
+    TH: ["<table><tr>", "</tr></table>"],
+};
+// One DOM walk for the whole selector group answers the common "nothing yet"
+// case while the wait is polling; priority order only matters once it matches
+try {
+    if (!document.querySelector(selectors.join(", "))) {
+        return null;
+    }
+} catch (e) {
+    // An unsupported selector invalidates the group; probe them one by one
+}
+for (const selector of selectors) {
+    let elements;
+    try {
+        elements = document.querySelectorAll(selector);
+    } catch (e) {
+        continue;
+    }
+    if (!elements.length) {
+        continue;
+    }
+    const cards = Array.from(elements).slice(0, limit).flatMap(el => {
+        const text = el.innerText || "";
+        if (text.trim().length > maxTextLength) {
+            return [];
+        }
+        const card = el.cloneNode(true);
+        card.setAttribute("data-scraper-card", "");
+        const [open, close] = wrappers[el.tagName] || ["", ""];
+        return [{text: text, html: open + card.outerHTML + close}];
+    });
+    return {selector: selector, count: elements.length, cards: cards};
+}
+return null;
+"""
+
+# Runs in the page: returns {text, html} for every link whose URL looks like a
+# job posting, with each link tagged data-scraper-card like PROBE_SELECTORS_JS.
+JOB_LINKS_JS = """
+return Array.from(document.querySelectorAll("a[href]"))
+    .filter(a => /\\/(job|career|position|opening)/i.test(a.href))
+    .map(a => {
+        const card = a.cloneNode(true);
+        card.setAttribute("data-scraper-card", "");
+        return {text: a.innerText.trim(), html: card.outerHTML};
+    });
+"""
+
+# Text-cleaning patterns, compiled once for the per-card hot path
+UI_LABEL_RE = re.compile(
+    r'^(?:Location|Categories?|Filters?|Business Unit|Company|Save|View Job|Apply Now|Apply'
+    r'|\d+ Results?|home|Remote)$',
+    re.IGNORECASE
+)
+# UI labels that are never job titles, compared lowercased
+NON_TITLE_LABELS = frozenset({
+    "filter", "filters", "location", "category", "categories", "save",
+    "apply", "view", "company", "result", "results", "home",
+})
+# Site-chrome links that pass the word checks but are never job postings
+SITE_LINK_LABEL_RE = re.compile(
+    r'^(?:cookie (?:policy|settings|preferences)|privacy (?:policy|notice|statement)'
+    r'|terms (?:of use|of service|and conditions|& conditions)|log\s*in|sign\s*(?:in|up))$',
+    re.IGNORECASE
+)
+ACTION_LABEL_RE = re.compile(r'^(Save|Apply|View)', re.IGNORECASE)
+LOCATION_PREFIX_RE = re.compile(r'^Location:\s*', re.IGNORECASE)
+WHITESPACE_RE = re.compile(r'\s+')
+# innerText puts line breaks between blocks and tabs between table cells
+CARD_LINE_BREAK_RE = re.compile(r'[\n\t]')
+LOCALE_SEGMENT_RE = re.compile(r'^[a-z]{2}-[A-Z]{2}$')
+
 # Logging setup
 logging.basicConfig(
     level=logging.INFO,
@@ -65,9 +225,21 @@ retries = Retry(
     backoff_factor=RETRY_BACKOFF_FACTOR,
     status_forcelist=(429, 500, 502, 503, 504)
 )
-session.mount("https://", HTTPAdapter(max_retries=retries))
+# Keep enough pooled keep-alive connections for every worker thread and host
+adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retries)
+session.mount("https://", adapter)
+session.mount("http://", adapter)
 session.headers.update(HEADERS)
 
+# Politeness is per host: when each host may next be requested (time.monotonic)
+_host_next_slot: Dict[str, float] = {}
+_host_lock = threading.Lock()
+
+# One Chrome instance per worker thread, reused across the sites it scrapes
+_thread_local = threading.local()
+_drivers: List["webdriver.Chrome"] = []
+_drivers_lock = threading.Lock()
+
 # Complete list of companies with their career page configurations
 SITES = [
     # Original companies
@@ -565,38 +737,137 @@ SITES = [
 ]
 
 
-def get_selenium_driver() -> webdriver.Chrome:
+def create_selenium_driver() -> "webdriver.Chrome":
     """Create and configure a Selenium Chrome WebDriver instance."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    
     chrome_options = Options()
+    # Job listings are in the initial DOM; don't wait for every subresource
+    chrome_options.page_load_strategy = "eager"
     chrome_options.add_argument("--headless")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
     chrome_options.add_argument(f"user-agent={HEADERS['User-Agent']}")
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
     
     driver = webdriver.Chrome(options=chrome_options)
     driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
     return driver
 
 
-def allowed_to_scrape(base_url: str, path: str = "/") -> bool:
-    """Check if scraping is allowed according to robots.txt."""
-    rp = urllib.robotparser.RobotFileParser()
-    parsed = urlparse(base_url)
-    robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+def get_selenium_driver() -> "webdriver.Chrome":
+    """Return the calling thread's WebDriver, creating it on first use."""
+    driver = getattr(_thread_local, "driver", None)
+    if driver is None:
+        driver = create_selenium_driver()
+        _thread_local.driver = driver
+        with _drivers_lock:
+            _drivers.append(driver)
+    return driver
+
+
+def discard_selenium_driver() -> None:
+    """Quit the calling thread's WebDriver so the next site gets a fresh one."""
+    driver = getattr(_thread_local, "driver", None)
+    if driver is None:
+        return
+    from selenium.common.exceptions import WebDriverException
     
+    _thread_local.driver = None
+    with _drivers_lock:
+        if driver in _drivers:
+            _drivers.remove(driver)
     try:
-        rp.set_url(robots_url)
-        rp.read()
-        can_fetch = rp.can_fetch("*", urljoin(base_url, path))
-        if not can_fetch:
-            logger.warning(f"robots.txt forbids fetching {path}")
-        return can_fetch
-    except Exception as e:
+        driver.quit()
+    except WebDriverException as e:
+        logger.debug(f"Error quitting WebDriver: {e}")
+
+
+def quit_all_selenium_drivers() -> None:
+    """Quit every WebDriver created by the worker threads."""
+    with _drivers_lock:
+        drivers = list(_drivers)
+        _drivers.clear()
+    if not drivers:
+        return
+    from selenium.common.exceptions import WebDriverException
+    
+    for driver in drivers:
+        try:
+            driver.quit()
+        except WebDriverException as e:
+            logger.debug(f"Error quitting WebDriver: {e}")
+
+
+@functools.lru_cache(maxsize=256)
+def load_robots(scheme: str, netloc: str) -> Optional[urllib.robotparser.RobotFileParser]:
+    """Fetch and parse a host's robots.txt once; None if the host could not be reached."""
+    robots_url = f"{scheme}://{netloc}/robots.txt"
+    rp = urllib.robotparser.RobotFileParser(robots_url)
+    
+    try:
+        wait_for_host(robots_url)
+        resp = session.get(robots_url, timeout=REQUEST_TIMEOUT)
+        # Same status handling as RobotFileParser.read(), where a server error
+        # leaves the parser unread and so disallows everything
+        if resp.status_code in (401, 403) or resp.status_code >= 500:
+            rp.disallow_all = True
+        elif 400 <= resp.status_code < 500:
+            rp.allow_all = True
+        else:
+            resp.raise_for_status()
+            rp.parse(resp.text.splitlines())
+        rp.modified()
+        return rp
+    except requests.exceptions.RetryError as e:
+        # The session retries 429 and 5xx responses and raises this once they run out
+        logger.warning(f"robots.txt from {robots_url} kept failing, treating the site as disallowed: {e}")
+        rp.disallow_all = True
+        rp.modified()
+        return rp
+    except requests.RequestException as e:
         logger.warning(f"Could not fetch or parse robots.txt from {robots_url}: {e}")
+        return None
+
+
+def wait_for_host(url: str) -> None:
+    """Sleep only as long as needed to keep a polite delay between requests to url's host.
+
+    Requests to different hosts never wait on each other.
+    """
+    host = urlparse(url).netloc.lower()
+    with _host_lock:
+        now = time.monotonic()
+        slot = max(now, _host_next_slot.get(host, now))
+        _host_next_slot[host] = slot + uniform(MIN_DELAY_SECONDS, MAX_DELAY_SECONDS)
+    if slot > now:
+        time.sleep(slot - now)
+
+
+def allowed_to_fetch(url: str) -> bool:
+    """Check robots.txt on url's own host for url's path."""
+    parsed = urlparse(url)
+    return allowed_to_scrape(f"{parsed.scheme}://{parsed.netloc}", parsed.path)
+
+
+def allowed_to_scrape(base_url: str, path: str = "/") -> bool:
+    """Check if scraping is allowed according to robots.txt."""
+    parsed = urlparse(base_url)
+    rp = load_robots(parsed.scheme, parsed.netloc)
+    if rp is None:
         return True
+    
+    can_fetch = rp.can_fetch("*", urljoin(base_url, path))
+    if not can_fetch:
+        logger.warning(f"robots.txt forbids fetching {path}")
+    return can_fetch
 
 
 def clean_text(text: str) -> str:
@@ -605,42 +876,47 @@ def clean_text(text: str) -> str:
         return ""
     
     # Remove common UI elements and labels
-    ui_patterns = [
-        r'^(Location|Categories?|Filters?|Business Unit|Company|Save|View Job|Apply Now|Apply)$',
-        r'^\d+ Results?$',
-        r'^home$',
-        r'^Remote$',
-    ]
-    
-    for pattern in ui_patterns:
-        if re.match(pattern, text.strip(), re.IGNORECASE):
-            return ""
+    if UI_LABEL_RE.match(text.strip()):
+        return ""
     
     # Clean whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = WHITESPACE_RE.sub(' ', text).strip()
     
     # Remove "Location:" prefix
-    text = re.sub(r'^Location:\s*', '', text, flags=re.IGNORECASE)
+    text = LOCATION_PREFIX_RE.sub('', text)
     
     return text
 
 
+def normalize_job_url(url: str) -> str:
+    """Strip utm_* tracking parameters from a job URL, leaving the rest of it untouched."""
+    parsed = urlparse(url)
+    if not parsed.query:
+        return url
+    
+    # Filter the raw pairs so the kept ones are not re-encoded
+    pairs = parsed.query.split("&")
+    kept = [pair for pair in pairs if not pair.lower().startswith("utm_")]
+    if len(kept) == len(pairs):
+        return url
+    return urlunparse(parsed._replace(query="&".join(kept)))
+
+
 def is_valid_job_title(title: str) -> bool:
     """Check if a string is likely a valid job title."""
     if not title or len(title) < 3:
         return False
     
-    # Common non-job-title patterns
-    invalid_patterns = [
-        r'^(Filters?|Location|Categories?|Save|Apply|View|Company|Results?)$',
-        r'^\d+$',  # Just numbers
-        r'^[A-Z]{2,3}$',  # State codes
-        r'^home$',
-    ]
-    
-    for pattern in invalid_patterns:
-        if re.match(pattern, title.strip(), re.IGNORECASE):
-            return False
+    # Common non-job-title patterns, checked without the regex engine
+    stripped = title.strip()
+    if stripped.lower() in NON_TITLE_LABELS:
+        return False
+    if stripped.isdecimal():  # Just numbers
+        return False
+    if 2 <= len(stripped) <= 3 and stripped.isascii() and stripped.isalpha():  # State codes
+        return False
+    if SITE_LINK_LABEL_RE.match(stripped):
+        return False
     
     # Job titles usually have at least one word with 3+ letters
     words = title.split()
@@ -649,246 +925,177 @@ def is_valid_job_title(title: str) -> bool:
     return has_real_word
 
 
-def scrape_workday_site(driver: webdriver.Chrome, site_conf: Dict, max_jobs: int) -> List[Dict]:
-    """Special handling for Workday ATS sites."""
+def card_text_lines(text: Optional[str], max_length: int = MAX_CARD_TEXT_LENGTH) -> List[str]:
+    """Split a card's rendered innerText into lines, or [] if it is empty or too long."""
+    text = (text or "").strip()
+    if not text or len(text) > max_length:
+        return []
+    return CARD_LINE_BREAK_RE.split(text)
+
+
+def extract_cards(driver: "webdriver.Chrome", card_selectors: List[str], title_selector: str,
+                  location_selector: str, max_jobs: int) -> List[Dict[str, Optional[str]]]:
+    """Extract title, location and href for the first matching card selector in one script call."""
+    return driver.execute_script(EXTRACT_CARDS_JS, card_selectors, title_selector, location_selector, max_jobs) or []
+
+
+def build_jobs_from_cards(cards: List[Dict[str, Optional[str]]], site_conf: Dict) -> List[Dict]:
+    """Clean and validate card data returned by extract_cards."""
     jobs = []
-    jobs_url = site_conf["jobs_url"]
-    
-    try:
-        driver.get(jobs_url)
-        time.sleep(5)  # Workday sites load slowly
+    for card in cards:
+        title = clean_text(card.get("title") or "")
+        if not is_valid_job_title(title):
+            continue
         
-        # Workday-specific selectors
-        job_selectors = [
+        jobs.append({
+            "company": site_conf["company"],
+            "title": title,
+            "location": clean_text(card.get("location") or "") or "Not specified",
+            "url": card.get("href") or site_conf["jobs_url"]
+        })
+    return jobs
+
+
+# Card, title and location selectors for ATS boards rendered in the browser.
+# Card selectors are tried in order; the first one with matches is used.
+ATS_SELENIUM_CONFIGS = {
+    "workday": {
+        "label": "Workday job items",
+        "cards": [
             "li[data-automation-id='jobItem']",
             "div[data-automation-id='jobItem']",
             "[role='listitem'] a[data-automation-id='jobTitle']",
-        ]
-        
-        cards = []
-        for selector in job_selectors:
-            try:
-                cards = WebDriverWait(driver, 10).until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
-                )
-                if cards:
-                    logger.info(f"Found {len(cards)} Workday job items")
-                    break
-            except TimeoutException:
-                continue
-        
-        for card in cards[:max_jobs]:
-            try:
-                # Extract title
-                title_element = card.find_element(By.CSS_SELECTOR, "[data-automation-id='jobTitle']")
-                title = clean_text(title_element.text)
-                
-                if not is_valid_job_title(title):
-                    continue
-                
-                # Extract location
-                location = "Not specified"
-                try:
-                    location_element = card.find_element(By.CSS_SELECTOR, "[data-automation-id='location']")
-                    location = clean_text(location_element.text)
-                except:
-                    pass
-                
-                # Get URL
-                try:
-                    link = title_element.get_attribute("href")
-                    if not link:
-                        link = card.find_element(By.TAG_NAME, "a").get_attribute("href")
-                except:
-                    link = jobs_url
-                
-                jobs.append({
-                    "company": site_conf["company"],
-                    "title": title,
-                    "location": location or "Not specified",
-                    "url": link or jobs_url
-                })
-                
-            except Exception as e:
-                logger.debug(f"Error processing Workday job card: {e}")
-                continue
-                
-    except Exception as e:
-        logger.error(f"Error scraping Workday site {site_conf['name']}: {e}")
-    
-    return jobs
+        ],
+        "title": "[data-automation-id='jobTitle']",
+        "location": "[data-automation-id='location']",
+        # Workday renders its job list client-side after the load event
+        "wait_for_load": True,
+    },
+    "greenhouse": {
+        "label": "Greenhouse job openings",
+        "cards": ["div.opening"],
+        "title": "a",
+        "location": ".location",
+    },
+    "lever": {
+        "label": "Lever job postings",
+        "cards": [".posting", "a[class*='posting-title']"],
+        "title": ".posting-title",
+        "location": ".posting-categories .location",
+    },
+}
 
 
-def scrape_greenhouse_site(driver: webdriver.Chrome, site_conf: Dict, max_jobs: int) -> List[Dict]:
-    """Special handling for Greenhouse ATS sites."""
-    jobs = []
-    jobs_url = site_conf["jobs_url"]
+def make_ats_scraper(ats_type: str, config: Dict) -> Callable[["webdriver.Chrome", Dict, int], List[Dict]]:
+    """Build a Selenium scraper for one ATS with its selectors bound up front."""
+    label = config["label"]
+    card_selectors = list(config["cards"])
+    title_selector = config["title"]
+    location_selector = config["location"]
+    wait_for_load = config.get("wait_for_load", False)
     
-    try:
+    def scrape_ats_site(driver: "webdriver.Chrome", site_conf: Dict, max_jobs: int) -> List[Dict]:
+        # WebDriver errors propagate to scrape_with_selenium, which discards the driver
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+        
+        jobs_url = site_conf["jobs_url"]
+        wait_for_host(jobs_url)
         driver.get(jobs_url)
-        time.sleep(3)
+        if wait_for_load:
+            try:
+                WebDriverWait(driver, SELENIUM_WAIT_TIMEOUT).until(
+                    lambda d: d.execute_script("return document.readyState") == "complete"
+                )
+            except TimeoutException:
+                logger.debug(f"Timed out waiting for {jobs_url} to finish loading")
         
-        # Greenhouse-specific selectors
-        cards = driver.find_elements(By.CSS_SELECTOR, "div.opening")
-        logger.info(f"Found {len(cards)} Greenhouse job openings")
+        # Poll the extraction script itself: the first tick with cards returns them
+        try:
+            cards = WebDriverWait(driver, 10).until(
+                lambda d: extract_cards(d, card_selectors, title_selector, location_selector, max_jobs)
+            )
+        except TimeoutException:
+            cards = []
         
-        for card in cards[:max_jobs]:
-            try:
-                # Extract title
-                title_element = card.find_element(By.CSS_SELECTOR, "a")
-                title = clean_text(title_element.text)
-                
-                if not is_valid_job_title(title):
-                    continue
-                
-                # Extract location
-                location = "Not specified"
-                try:
-                    location_element = card.find_element(By.CSS_SELECTOR, ".location")
-                    location = clean_text(location_element.text)
-                except:
-                    pass
-                
-                # Get URL
-                link = title_element.get_attribute("href")
-                
-                jobs.append({
-                    "company": site_conf["company"],
-                    "title": title,
-                    "location": location,
-                    "url": link or jobs_url
-                })
-                
-            except Exception as e:
-                logger.debug(f"Error processing Greenhouse job card: {e}")
-                continue
-                
-    except Exception as e:
-        logger.error(f"Error scraping Greenhouse site {site_conf['name']}: {e}")
+        logger.info(f"Found {len(cards)} {label}")
+        return build_jobs_from_cards(cards, site_conf)
     
-    return jobs
+    scrape_ats_site.__name__ = f"scrape_{ats_type}_site"
+    scrape_ats_site.__doc__ = f"Scrape a {ats_type} ATS site rendered in Selenium."
+    return scrape_ats_site
 
 
-def scrape_lever_site(driver: webdriver.Chrome, site_conf: Dict, max_jobs: int) -> List[Dict]:
-    """Special handling for Lever ATS sites."""
-    jobs = []
-    jobs_url = site_conf["jobs_url"]
-    
-    try:
-        driver.get(jobs_url)
-        time.sleep(3)
-        
-        # Lever-specific selectors
-        cards = driver.find_elements(By.CSS_SELECTOR, ".posting")
-        if not cards:
-            cards = driver.find_elements(By.CSS_SELECTOR, "a[class*='posting-title']")
-        
-        logger.info(f"Found {len(cards)} Lever job postings")
-        
-        for card in cards[:max_jobs]:
-            try:
-                title = clean_text(card.find_element(By.CSS_SELECTOR, ".posting-title").text)
-                if not is_valid_job_title(title):
-                    continue
-                
-                location = "Not specified"
-                try:
-                    location = clean_text(card.find_element(By.CSS_SELECTOR, ".posting-categories location").text)
-                except:
-                    pass
-                
-                link = card.get_attribute("href") if card.tag_name == "a" else card.find_element(By.TAG_NAME, "a").get_attribute("href")
-                
-                jobs.append({
-                    "company": site_conf["company"],
-                    "title": title,
-                    "location": location,
-                    "url": link or jobs_url
-                })
-                
-            except Exception as e:
-                logger.debug(f"Error processing Lever job card: {e}")
-                continue
-                
-    except Exception as e:
-        logger.error(f"Error scraping Lever site {site_conf['name']}: {e}")
-    
-    return jobs
+SELENIUM_SCRAPERS = {
+    ats_type: make_ats_scraper(ats_type, config)
+    for ats_type, config in ATS_SELENIUM_CONFIGS.items()
+}
 
 
 def scrape_with_selenium(site_conf: Dict, max_jobs: int = MAX_JOBS_PER_SITE) -> List[Dict[str, Optional[str]]]:
     """Scrape job listings using Selenium with ATS-specific handling."""
+    from selectolax.lexbor import LexborHTMLParser
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+    from selenium.webdriver.support.ui import WebDriverWait
+    
     jobs = []
-    driver = None
     
     try:
         logger.info(f"[SELENIUM] Loading {site_conf['jobs_url']}")
         driver = get_selenium_driver()
+        # The driver is reused across sites, so drop every cookie the previous
+        # site set (delete_all_cookies only covers the current page's domain)
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
         
         # Route to ATS-specific scraper if available
-        ats_type = site_conf.get("ats_type", "custom")
+        ats_scraper = SELENIUM_SCRAPERS.get(site_conf.get("ats_type", "custom"))
         
-        if ats_type == "workday":
-            jobs = scrape_workday_site(driver, site_conf, max_jobs)
-        elif ats_type == "greenhouse":
-            jobs = scrape_greenhouse_site(driver, site_conf, max_jobs)
-        elif ats_type == "lever":
-            jobs = scrape_lever_site(driver, site_conf, max_jobs)
+        if ats_scraper:
+            jobs = ats_scraper(driver, site_conf, max_jobs)
         else:
             # Generic scraping with better filtering
+            wait_for_host(site_conf["jobs_url"])
             driver.get(site_conf["jobs_url"])
-            time.sleep(4)
-            
-            # Try various selectors
-            selectors_to_try = [
-                "a[href*='/job']:not([class*='filter'])",
-                "a[href*='/career']:not([class*='filter'])",
-                "div[class*='job-card']",
-                "li[class*='job-item']",
-                "article[class*='job']",
-                "div.opening",
-                "[data-job-id]",
-                "div[class*='posting']",
-                "tbody tr:has(a)",
-            ]
+            # Poll all selectors with one script per tick; the first tick with
+            # a match also returns the cards, so only they are parsed
+            try:
+                match = WebDriverWait(driver, GENERIC_WAIT_TIMEOUT).until(
+                    lambda d: d.execute_script(PROBE_SELECTORS_JS, GENERIC_CARD_SELECTORS, max_jobs * 2,
+                                               MAX_CARD_TEXT_LENGTH)
+                )
+            except TimeoutException:
+                match = None
+            page_url = driver.current_url
             
             cards = []
-            for selector in selectors_to_try:
-                try:
-                    potential_cards = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if potential_cards:
-                        logger.info(f"Found {len(potential_cards)} elements with selector: {selector}")
-                        cards = potential_cards
-                        break
-                except:
-                    continue
+            if match:
+                logger.info(f"Found {match['count']} elements with selector: {match['selector']}")
+                cards = match["cards"]
             
             if not cards:
                 # Last resort: find all links that might be jobs
-                all_links = driver.find_elements(By.TAG_NAME, "a")
-                job_links = []
-                for link in all_links:
-                    href = link.get_attribute("href") or ""
-                    text = link.text.strip()
-                    if (("/job" in href.lower() or "/career" in href.lower() or 
-                         "/position" in href.lower() or "/opening" in href.lower()) and
-                        is_valid_job_title(text)):
-                        job_links.append(link)
+                links = driver.execute_script(JOB_LINKS_JS) or []
+                cards = [link for link in links if is_valid_job_title(link["text"])]
                 
-                if job_links:
-                    logger.info(f"Found {len(job_links)} potential job links")
-                    cards = job_links
+                if cards:
+                    logger.info(f"Found {len(cards)} potential job links")
             
-            # Process cards
+            # Process cards, skipping repeated markup before any text extraction.
+            # Lines come from the browser's innerText so inline tags don't split
+            # a title and hidden text is left out; the html is only parsed for
+            # the link once a card has a title.
+            seen_cards = set()
             seen_titles = set()
             for card in cards[:max_jobs * 2]:
                 try:
-                    card_text = card.text.strip() if hasattr(card, 'text') else card.get_attribute('innerText') or ""
-                    
-                    if not card_text or len(card_text) > 500:
+                    signature = hashlib.blake2b(card["html"].encode(), digest_size=8).digest()
+                    if signature in seen_cards:
                         continue
+                    seen_cards.add(signature)
                     
-                    lines = card_text.split('\n')
+                    lines = card_text_lines(card["text"])
+                    if not lines:
+                        continue
                     
                     title = None
                     location = None
@@ -901,30 +1108,27 @@ def scrape_with_selenium(site_conf: Dict, max_jobs: int = MAX_JOBS_PER_SITE) ->
                         if not title and is_valid_job_title(line):
                             title = line
                         elif title and not location and len(line) > 2:
-                            if not re.match(r'^(Save|Apply|View)', line, re.IGNORECASE):
+                            if not ACTION_LABEL_RE.match(line):
                                 location = line
                                 break
                     
-                    if not title or title in seen_titles:
+                    if not title:
                         continue
                     
-                    seen_titles.add(title)
+                    title_key = (title.casefold(), site_conf["company"])
+                    if title_key in seen_titles:
+                        continue
+                    seen_titles.add(title_key)
                     
-                    href = None
-                    try:
-                        if card.tag_name == 'a':
-                            href = card.get_attribute("href")
-                        else:
-                            link = card.find_element(By.TAG_NAME, "a")
-                            href = link.get_attribute("href")
-                    except:
-                        href = site_conf["jobs_url"]
+                    node = LexborHTMLParser(card["html"]).css_first("[data-scraper-card]")
+                    link = node if node.tag == "a" else node.css_first("a[href]")
+                    href = link.attributes.get("href") if link else None
                     
                     jobs.append({
                         "company": site_conf["company"],
                         "title": title,
                         "location": location or "Not specified",
-                        "url": href or site_conf["jobs_url"]
+                        "url": urljoin(page_url, href) if href else site_conf["jobs_url"]
                     })
                     
                     if len(jobs) >= max_jobs:
@@ -938,11 +1142,9 @@ def scrape_with_selenium(site_conf: Dict, max_jobs: int = MAX_JOBS_PER_SITE) ->
         
     except WebDriverException as e:
         logger.error(f"Selenium error for {site_conf['name']}: {e}")
+        discard_selenium_driver()
     except Exception as e:
         logger.error(f"Unexpected error for {site_conf['name']}: {e}")
-    finally:
-        if driver:
-            driver.quit()
     
     return jobs
 
@@ -955,12 +1157,23 @@ def scrape_with_api(site_conf: Dict, max_jobs: int = MAX_JOBS_PER_SITE) -> List[
     logger.info(f"[API] Fetching {api_url}")
     
     try:
-        resp = session.get(api_url, timeout=REQUEST_TIMEOUT)
-        resp.raise_for_status()
-        data = resp.json()
+        # SmartRecruiters API structure, paged with offset/limit
+        job_postings = []
+        while len(job_postings) < max_jobs:
+            wait_for_host(api_url)
+            resp = session.get(
+                api_url,
+                params={"offset": len(job_postings), "limit": SMARTRECRUITERS_PAGE_SIZE},
+                timeout=REQUEST_TIMEOUT
+            )
+            resp.raise_for_status()
+            data = orjson.loads(resp.content)
+            
+            page = data.get("content", [])
+            job_postings.extend(page)
+            if not page or len(job_postings) >= data.get("totalFound", 0):
+                break
         
-        # SmartRecruiters API structure
-        job_postings = data.get("content", [])
         logger.info(f"Found {len(job_postings)} jobs from API")
         
         for job in job_postings[:max_jobs]:
@@ -990,14 +1203,191 @@ def scrape_with_api(site_conf: Dict, max_jobs: int = MAX_JOBS_PER_SITE) -> List[
     return jobs
 
 
-def scrape_site(site_conf: Dict, max_jobs: int = MAX_JOBS_PER_SITE) -> List[Dict[str, Optional[str]]]:
-    """Scrape job listings from a single site."""
+def _first_path_segment(path: str) -> Optional[str]:
+    """Return the first non-empty path segment, skipping a locale like 'en-US'."""
+    segments = [segment for segment in path.split("/") if segment]
+    if segments and LOCALE_SEGMENT_RE.match(segments[0]):
+        segments = segments[1:]
+    return segments[0] if segments else None
+
+
+def scrape_workday_api(site_conf: Dict, max_jobs: int = MAX_JOBS_PER_SITE) -> Optional[List[Dict[str, Optional[str]]]]:
+    """Scrape a *.myworkdayjobs.com board through its CXS JSON API.
+
+    Returns None when the site is not hosted on myworkdayjobs.com or robots.txt
+    forbids the API.
+    """
+    jobs_url = site_conf["jobs_url"]
+    parsed = urlparse(jobs_url)
+    board = _first_path_segment(parsed.path)
+    if not parsed.netloc.endswith(".myworkdayjobs.com") or not board:
+        return None
+    
+    tenant = parsed.netloc.split(".")[0]
+    base_url = f"{parsed.scheme}://{parsed.netloc}"
+    api_url = f"{base_url}/wday/cxs/{tenant}/{board}/jobs"
+    if not allowed_to_fetch(api_url):
+        # Let scrape_site fall back to the career page in a browser
+        logger.warning(f"[SKIP] robots.txt forbids fetching {api_url}")
+        return None
+    
+    jobs = []
+    
+    logger.info(f"[API] Fetching {api_url}")
+    
+    try:
+        offset = 0
+        total = None
+        while len(jobs) < max_jobs:
+            wait_for_host(api_url)
+            resp = session.post(
+                api_url,
+                json={"appliedFacets": {}, "limit": WORKDAY_PAGE_SIZE, "offset": offset, "searchText": ""},
+                headers={"Accept": "application/json"},
+                timeout=REQUEST_TIMEOUT
+            )
+            resp.raise_for_status()
+            data = orjson.loads(resp.content)
+            
+            # Workday only reports the total on the first page
+            if total is None:
+                total = data.get("total", 0)
+            
+            postings = data.get("jobPostings", [])
+            for posting in postings:
+                external_path = posting.get("externalPath")
+                jobs.append({
+                    "company": site_conf["company"],
+                    "title": posting.get("title", "Unknown Title"),
+                    "location": posting.get("locationsText") or "Not specified",
+                    "url": f"{base_url}/{board}{external_path}" if external_path else jobs_url
+                })
+            
+            offset += len(postings)
+            if not postings or offset >= total:
+                break
+        
+        logger.info(f"Found {len(jobs)} jobs from Workday API")
+        
+    except requests.RequestException as e:
+        logger.error(f"Failed to fetch Workday API: {e}")
+    except (KeyError, ValueError) as e:
+        logger.error(f"Failed to parse Workday API response: {e}")
+    
+    return jobs[:max_jobs]
+
+
+def scrape_greenhouse_api(site_conf: Dict, max_jobs: int = MAX_JOBS_PER_SITE) -> Optional[List[Dict[str, Optional[str]]]]:
+    """Scrape a Greenhouse-hosted board through the Greenhouse job board API.
+
+    Returns None when the site is not hosted on greenhouse.io or robots.txt
+    forbids the API.
+    """
+    jobs_url = site_conf["jobs_url"]
+    parsed = urlparse(jobs_url)
+    token = _first_path_segment(parsed.path)
+    if parsed.netloc not in ("boards.greenhouse.io", "job-boards.greenhouse.io") or not token:
+        return None
+    
+    api_url = GREENHOUSE_API_URL.format(token=token)
+    if not allowed_to_fetch(api_url):
+        # Let scrape_site fall back to the career page in a browser
+        logger.warning(f"[SKIP] robots.txt forbids fetching {api_url}")
+        return None
+    
+    jobs = []
+    
+    logger.info(f"[API] Fetching {api_url}")
+    wait_for_host(api_url)
+    
+    try:
+        resp = session.get(api_url, timeout=REQUEST_TIMEOUT)
+        resp.raise_for_status()
+        job_postings = orjson.loads(resp.content).get("jobs", [])
+        logger.info(f"Found {len(job_postings)} jobs from Greenhouse API")
+        
+        for job in job_postings[:max_jobs]:
+            jobs.append({
+                "company": site_conf["company"],
+                "title": job.get("title", "Unknown Title"),
+                "location": (job.get("location") or {}).get("name") or "Not specified",
+                "url": job.get("absolute_url") or jobs_url
+            })
+            
+    except requests.RequestException as e:
+        logger.error(f"Failed to fetch Greenhouse API: {e}")
+    except (KeyError, ValueError, AttributeError) as e:
+        logger.error(f"Failed to parse Greenhouse API response: {e}")
+    
+    return jobs
+
+
+def scrape_lever_api(site_conf: Dict, max_jobs: int = MAX_JOBS_PER_SITE) -> Optional[List[Dict[str, Optional[str]]]]:
+    """Scrape a Lever-hosted board through the Lever postings API.
+
+    Returns None when the site is not hosted on jobs.lever.co or robots.txt
+    forbids the API.
+    """
+    jobs_url = site_conf["jobs_url"]
+    parsed = urlparse(jobs_url)
+    company = _first_path_segment(parsed.path)
+    if parsed.netloc != "jobs.lever.co" or not company:
+        return None
+    
+    api_url = LEVER_API_URL.format(company=company)
+    if not allowed_to_fetch(api_url):
+        # Let scrape_site fall back to the career page in a browser
+        logger.warning(f"[SKIP] robots.txt forbids fetching {api_url}")
+        return None
+    
+    jobs = []
+    
+    logger.info(f"[API] Fetching {api_url}")
+    wait_for_host(api_url)
+    
+    try:
+        resp = session.get(api_url, params={"mode": "json"}, timeout=REQUEST_TIMEOUT)
+        resp.raise_for_status()
+        job_postings = orjson.loads(resp.content)
+        logger.info(f"Found {len(job_postings)} jobs from Lever API")
+        
+        for job in job_postings[:max_jobs]:
+            jobs.append({
+                "company": site_conf["company"],
+                "title": job.get("text", "Unknown Title"),
+                "location": (job.get("categories") or {}).get("location") or "Not specified",
+                "url": job.get("hostedUrl") or jobs_url
+            })
+            
+    except requests.RequestException as e:
+        logger.error(f"Failed to fetch Lever API: {e}")
+    except (KeyError, ValueError, AttributeError) as e:
+        logger.error(f"Failed to parse Lever API response: {e}")
+    
+    return jobs
+
+
+# ATS types whose hosted boards can be read without a browser
+ATS_API_SCRAPERS = {
+    "workday": scrape_workday_api,
+    "greenhouse": scrape_greenhouse_api,
+    "lever": scrape_lever_api,
+}
+
+
+def scrape_site(site_conf: Dict, max_jobs: int = MAX_JOBS_PER_SITE,
+                use_browser: bool = True, use_api_scraper: bool = True) -> Optional[List[Dict[str, Optional[str]]]]:
+    """Scrape job listings from a single site.
+
+    With use_browser=False, returns None instead of starting Selenium when the
+    site cannot be scraped over plain HTTP. With use_api_scraper=False, the
+    ATS JSON API is skipped, for sites whose API already came back empty.
+    """
     # Check robots.txt for non-API methods
     if not site_conf.get("use_api", False):
         jobs_url = site_conf["jobs_url"]
-        parsed = urlparse(jobs_url)
         
-        if not allowed_to_scrape(f"{parsed.scheme}://{parsed.netloc}", parsed.path):
+        if not allowed_to_fetch(jobs_url):
             logger.warning(f"[SKIP] robots.txt forbids scraping {jobs_url}")
             return []
 
@@ -1007,7 +1397,15 @@ def scrape_site(site_conf: Dict, max_jobs: int = MAX_JOBS_PER_SITE) -> List[Dict
     if site_conf.get("use_api", False):
         jobs = scrape_with_api(site_conf, max_jobs)
     elif site_conf.get("use_selenium", False):
-        jobs = scrape_with_selenium(site_conf, max_jobs)
+        # Prefer the ATS JSON API and only start a browser if it yields nothing
+        jobs = None
+        api_scraper = ATS_API_SCRAPERS.get(site_conf.get("ats_type", "custom"))
+        if api_scraper and use_api_scraper:
+            jobs = api_scraper(site_conf, max_jobs)
+        if not jobs:
+            if not use_browser:
+                return None
+            jobs = scrape_with_selenium(site_conf, max_jobs)
     else:
         logger.warning(f"No scraping method specified for {site_conf['name']}")
         jobs = []
@@ -1021,70 +1419,165 @@ def scrape_site(site_conf: Dict, max_jobs: int = MAX_JOBS_PER_SITE) -> List[Dict
         if job.get("location"):
             job["location"] = clean_text(job["location"]) or "Not specified"
         
+        if job.get("url"):
+            job["url"] = normalize_job_url(job["url"])
+        
         cleaned_jobs.append(job)
     
     logger.info(f"Cleaned {len(cleaned_jobs)} valid jobs from {len(jobs)} raw entries")
-    
-    # Polite delay
-    time.sleep(uniform(MIN_DELAY_SECONDS, MAX_DELAY_SECONDS))
     return cleaned_jobs
 
 
-def save_to_csv(rows: List[Dict], filename: str = OUTPUT_CSV) -> None:
-    """Save job listings to a CSV file."""
-    keys = ["company", "title", "location", "url"]
-    
-    try:
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=keys)
-            writer.writeheader()
-            writer.writerows(rows)
-        logger.info(f"Saved {len(rows)} rows to {filename}")
-    except IOError as e:
-        logger.error(f"Failed to save CSV: {e}")
+def dedupe_sites(sites: List[Dict]) -> List[Dict]:
+    """Drop site entries that point at the same listing URL as an earlier entry."""
+    seen_urls = set()
+    unique_sites = []
+    for site in sites:
+        url = site.get("api_url") or site.get("jobs_url", "")
+        parsed = urlparse(url)
+        signature = (parsed.netloc.lower(), parsed.path.rstrip("/").lower(), parsed.query)
+        if signature in seen_urls:
+            logger.warning(f"Skipping duplicate site entry {site.get('name', 'Unknown')} ({url})")
+            continue
+        seen_urls.add(signature)
+        unique_sites.append(site)
+    return unique_sites
+
+
+def group_sites_by_ats(sites: List[Dict]) -> Dict[str, List[Dict]]:
+    """Partition sites by ATS type, using "api" for sites scraped with scrape_with_api."""
+    groups = defaultdict(list)
+    for site in sites:
+        ats_type = "api" if site.get("use_api", False) else site.get("ats_type", "custom")
+        groups[ats_type].append(site)
+    return dict(groups)
+
+
+# Pulls a job dict's values out in CSV_FIELDS order
+csv_row = itemgetter(*CSV_FIELDS)
+# Identifies the same posting across lists and sites
+job_key = itemgetter("company", "title", "location")
+
+
+def open_csv_writer(filename: str = OUTPUT_CSV) -> Tuple[TextIO, Any]:
+    """Open a line-buffered CSV file for job listings and write its header."""
+    f = open(filename, "w", newline="", encoding="utf-8", buffering=1)
+    writer = csv.writer(f)
+    writer.writerow(CSV_FIELDS)
+    return f, writer
+
+
+def open_job_db(filename: str = OUTPUT_DB) -> sqlite3.Connection:
+    """Open the SQLite job store in WAL mode, creating the jobs table if needed."""
+    conn = sqlite3.connect(filename)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # Many postings fall back to the site's jobs_url, so the URL alone is not unique
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS jobs ("
+        "company TEXT, title TEXT, location TEXT, url TEXT, "
+        "PRIMARY KEY (company, title, location, url))"
+    )
+    conn.commit()
+    return conn
 
 
 def main() -> None:
     """Main function to scrape all sites and save results."""
-    all_jobs = []
+    sites = dedupe_sites(SITES)
+    site_groups = group_sites_by_ats(sites)
+    # Sites that may be served by a JSON API start in the HTTP pool; the rest,
+    # and any API site that turns out to need a browser, go to the Selenium pool
+    http_sites = []
+    browser_sites = []
+    for ats_type, group in site_groups.items():
+        if ats_type == "api" or ats_type in ATS_API_SCRAPERS:
+            http_sites.extend(group)
+        else:
+            browser_sites.extend(group)
+    # The same posting often appears in several lists on one page
+    seen_jobs = set()
+    total_jobs = 0
     successful_sites = 0
     failed_sites = []
     
     print(f"\n{'='*60}")
-    print(f"Starting scraper for {len(SITES)} companies...")
+    print(f"Starting scraper for {len(sites)} companies "
+          f"({HTTP_WORKERS} HTTP workers, {SELENIUM_WORKERS} browsers)...")
+    for ats_type, group in site_groups.items():
+        print(f"  {ats_type}: {len(group)} sites")
     print(f"{'='*60}\n")
     
-    for i, site in enumerate(SITES, 1):
-        try:
-            print(f"[{i}/{len(SITES)}] Processing {site['name']}...", end=' ')
-            rows = scrape_site(site)
-            if rows:
-                all_jobs.extend(rows)
-                successful_sites += 1
-                print(f"✓ {len(rows)} jobs")
-            else:
-                failed_sites.append(site.get('name', 'Unknown'))
-                print(f"✗ No jobs found")
-        except Exception as e:
-            logger.error(f"Error scraping {site.get('name', 'Unknown')}: {e}")
-            failed_sites.append(site.get('name', 'Unknown'))
-            print(f"✗ Error")
+    # Workers scrape whole sites; rows are written here on the main thread
+    # as each site finishes, so a crash keeps everything scraped so far
+    csv_file, writer = open_csv_writer()
+    new_jobs = 0
+    try:
+        with csv_file, \
+                closing(open_job_db()) as db, \
+                ThreadPoolExecutor(max_workers=HTTP_WORKERS) as http_pool, \
+                ThreadPoolExecutor(max_workers=SELENIUM_WORKERS) as browser_pool:
+            pending = {http_pool.submit(scrape_site, site, use_browser=False): site for site in http_sites}
+            pending.update({browser_pool.submit(scrape_site, site): site for site in browser_sites})
+            
+            completed = 0
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    site = pending.pop(future)
+                    name = site.get('name', 'Unknown')
+                    try:
+                        rows = future.result()
+                    except Exception as e:
+                        logger.error(f"Error scraping {name}: {e}")
+                        completed += 1
+                        failed_sites.append(name)
+                        print(f"[{completed}/{len(sites)}] {name}: ✗ Error")
+                        continue
+                    
+                    if rows is None:
+                        # The JSON API had nothing; retry the site in a browser only
+                        pending[browser_pool.submit(scrape_site, site, use_api_scraper=False)] = site
+                        continue
+                    
+                    completed += 1
+                    unique_rows = []
+                    for job in rows:
+                        key = job_key(job)
+                        if key not in seen_jobs:
+                            seen_jobs.add(key)
+                            unique_rows.append(job)
+                    rows = unique_rows
+                    if rows:
+                        writer.writerows(map(csv_row, rows))
+                        # Postings already stored by an earlier run are skipped
+                        with db:
+                            new_jobs += db.executemany(
+                                "INSERT OR IGNORE INTO jobs VALUES (?, ?, ?, ?)", map(csv_row, rows)
+                            ).rowcount
+                        total_jobs += len(rows)
+                        successful_sites += 1
+                        print(f"[{completed}/{len(sites)}] {name}: ✓ {len(rows)} jobs")
+                    else:
+                        failed_sites.append(name)
+                        print(f"[{completed}/{len(sites)}] {name}: ✗ No jobs found")
+    finally:
+        quit_all_selenium_drivers()
+    
+    logger.info(f"Saved {total_jobs} rows to {OUTPUT_CSV} ({new_jobs} new in {OUTPUT_DB})")
     
     # Summary
     print(f"\n{'='*60}")
     print(f"SCRAPING COMPLETE")
-    print(f"Successful sites: {successful_sites}/{len(SITES)}")
+    print(f"Successful sites: {successful_sites}/{len(sites)}")
     if failed_sites:
         print(f"Failed sites: {len(failed_sites)}")
         print(f"  {', '.join(failed_sites[:10])}")
         if len(failed_sites) > 10:
             print(f"  ... and {len(failed_sites) - 10} more")
-    print(f"Total jobs collected: {len(all_jobs)}")
+    print(f"Total jobs collected: {total_jobs}")
     print(f"Output file: {OUTPUT_CSV}")
     print(f"{'='*60}\n")
-    
-    save_to_csv(all_jobs)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()